@@ -1,5 +1,4 @@
 import streamlit as st
-from PIL import Image
 
 def closet(show_text="Welcome!"):
     # st.subheader("*Welcome,*")
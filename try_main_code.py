@@ -2,18 +2,14 @@ import os
 import re
 import streamlit as st
 import pandas as pd
-from PIL import Image
-import requests
-from io import BytesIO
-import base64
-import json
+from io import BytesIO, StringIO
+import csv
+import orjson
+import xxhash
+from concurrent.futures import ThreadPoolExecutor
 from closet import closet
 from streamlit_option_menu import option_menu
 from dotenv import load_dotenv
-from openai import OpenAI
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
 
 # Load environment variables (for local .env fallback)
 load_dotenv()
@@ -25,28 +21,65 @@ def get_secret(key, default=None):
     except (KeyError, FileNotFoundError):
         return os.getenv(key, default)
 
-# Cloudinary configuration
-cloudinary.config(
-    cloud_name=get_secret("CLOUDINARY_CLOUD_NAME"),
-    api_key=get_secret("CLOUDINARY_API_KEY"),
-    api_secret=get_secret("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+# Cloudinary configuration (imported and configured on first use)
+@st.cache_resource
+def get_cloudinary_uploader():
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=get_secret("CLOUDINARY_CLOUD_NAME"),
+        api_key=get_secret("CLOUDINARY_API_KEY"),
+        api_secret=get_secret("CLOUDINARY_API_SECRET"),
+        secure=True
+    )
+    return cloudinary.uploader
+
+# OpenRouter configuration (client created once, on first use)
+@st.cache_resource
+def get_openrouter_client():
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        api_key=get_secret("OPENROUTER_API_KEY"),
+        default_headers={
+            "HTTP-Referer": "http://localhost:8501",
+            "X-Title": "Virtual Wardrobe",
+        }
+    )
 
-# OpenRouter configuration
-openrouter_client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=get_secret("OPENROUTER_API_KEY"),
-    default_headers={
-        "HTTP-Referer": "http://localhost:8501",
-        "X-Title": "Virtual Wardrobe",
-    }
-)
 OPENROUTER_MODEL = get_secret("OPENROUTER_MODEL", "meta-llama/llama-3.1-8b-instruct:free")
 
+# Suggestions are reused for the same prompt and unchanged wardrobe:
+# up to this many seconds, and at most this many distinct requests
+OUTFIT_CACHE_TTL = 3600
+OUTFIT_CACHE_MAX_ENTRIES = 64
+
+# Completion budget: a base allowance plus room per wardrobe item, capped
+OUTFIT_MAX_TOKENS = 4096
+OUTFIT_BASE_TOKENS = 200
+OUTFIT_TOKENS_PER_ITEM = 60
+
+# Outermost JSON array of arrays [[...]] in the model's reply
+OUTFIT_JSON_RE = re.compile(r'\[\s*\[.*?\]\s*\]', re.DOTALL)
+
 # Metadata file path
 METADATA_FILE = 'metadata.csv'
 
+# App stylesheet; the background image is served from static/ (see .streamlit/config.toml)
+STYLE_FILE = 'style.css'
+
+# Cap on simultaneous Cloudinary uploads for multi-file adds
+MAX_PARALLEL_UPLOADS = 8
+
+# Uploads are downscaled to this longest edge and re-encoded as JPEG
+UPLOAD_MAX_SIZE = 1600
+UPLOAD_JPEG_QUALITY = 82
+
+# Cloudinary delivery transformation for closet card thumbnails
+THUMBNAIL_TRANSFORMATION = "c_limit,w_400,q_auto,f_auto"
+
 st.set_page_config(
     page_title="Virtual Wardrobe",
     page_icon="👔",
@@ -57,181 +90,16 @@ st.set_page_config(
 # Custom CSS for professional UI
 # ──────────────────────────────────────────────
 
-st.markdown("""
-<style>
-    /* ── Global ── */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-    .stApp {
-        font-family: 'Inter', sans-serif;
-    }
-
-    /* ── Closet item card ── */
-    .closet-card {
-        position: relative;
-        background: rgba(255, 255, 255, 0.08);
-        backdrop-filter: blur(12px);
-        border: 1px solid rgba(255, 255, 255, 0.12);
-        border-radius: 16px;
-        padding: 12px;
-        margin-bottom: 16px;
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-        overflow: hidden;
-    }
-    .closet-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 8px 30px rgba(0, 0, 0, 0.25);
-    }
-    .closet-card img {
-        border-radius: 12px;
-        width: 100%;
-        object-fit: cover;
-    }
-    .card-label {
-        margin-top: 8px;
-        font-size: 13px;
-        font-weight: 500;
-        color: #e0e0e0;
-        text-align: center;
-    }
-    .card-badge {
-        display: inline-block;
-        font-size: 11px;
-        font-weight: 600;
-        padding: 3px 10px;
-        border-radius: 20px;
-        background: linear-gradient(135deg, #667eea, #764ba2);
-        color: #fff;
-        margin: 2px;
-    }
-
-    /* ── Delete icon button ── */
-    .delete-btn-wrap {
-        position: absolute;
-        top: 8px;
-        right: 8px;
-        z-index: 10;
-    }
-
-    /* ── Section headers ── */
-    .section-header {
-        font-size: 28px;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 6px;
-    }
-    .section-sub {
-        font-size: 14px;
-        color: #aaa;
-        margin-bottom: 24px;
-    }
-
-    /* ── Outfit card ── */
-    .outfit-header {
-        font-size: 18px;
-        font-weight: 600;
-        color: #e0e0e0;
-        padding: 10px 0 6px;
-        border-bottom: 2px solid rgba(102, 126, 234, 0.4);
-        margin-bottom: 12px;
-    }
-    .outfit-wrap {
-        background: rgba(255,255,255,0.05);
-        border-radius: 16px;
-        padding: 16px;
-        margin-bottom: 20px;
-        border: 1px solid rgba(255,255,255,0.08);
-    }
-
-    /* ── Upload area ── */
-    .upload-section {
-        background: rgba(255,255,255,0.05);
-        border-radius: 16px;
-        padding: 24px;
-        border: 1px dashed rgba(102, 126, 234, 0.5);
-        margin-bottom: 20px;
-    }
-
-    /* ── Form styling ── */
-    .stSelectbox > div > div,
-    .stTextInput > div > div > input {
-        border-radius: 10px !important;
-    }
-
-    /* ── Empty state ── */
-    .empty-state {
-        text-align: center;
-        padding: 60px 20px;
-        color: #888;
-    }
-    .empty-state .icon {
-        font-size: 64px;
-        margin-bottom: 16px;
-    }
-    .empty-state .msg {
-        font-size: 18px;
-        font-weight: 500;
-    }
-
-    /* ── Success toast ── */
-    .success-toast {
-        background: linear-gradient(135deg, #00c853, #00e676);
-        color: #fff;
-        padding: 14px 20px;
-        border-radius: 12px;
-        font-weight: 600;
-        text-align: center;
-        margin: 12px 0;
-    }
-
-    /* ── Filter sidebar ── */
-    .sidebar .sidebar-content {
-        background: rgba(0,0,0,0.3);
-    }
-
-    /* ── Hide default Streamlit button styling for delete icons ── */
-    .small-del button {
-        background: rgba(255, 80, 80, 0.15) !important;
-        border: 1px solid rgba(255, 80, 80, 0.3) !important;
-        border-radius: 50% !important;
-        padding: 4px 8px !important;
-        font-size: 14px !important;
-        line-height: 1 !important;
-        color: #ff5252 !important;
-        cursor: pointer;
-        transition: all 0.2s ease;
-    }
-    .small-del button:hover {
-        background: rgba(255, 80, 80, 0.35) !important;
-        transform: scale(1.15);
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-def add_bg_from_local(image_file):
-    with open(image_file, "rb") as image:
-        encoded_image = base64.b64encode(image.read()).decode()
-    st.markdown(
-        f"""
-        <style>
-        .stApp {{
-            background-image: url("data:image/jpeg;base64,{encoded_image}");
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-            background-attachment: fixed;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+@st.cache_data(show_spinner=False)
+def load_css(css_file, mtime):
+    """Read a stylesheet; cached per file modification time."""
+    with open(css_file, encoding="utf-8") as f:
+        return f.read()
 
-# Add local background image
-if os.path.exists("bg.jpg"):
-    add_bg_from_local("bg.jpg")
+st.markdown(
+    f"<style>{load_css(STYLE_FILE, os.path.getmtime(STYLE_FILE))}</style>",
+    unsafe_allow_html=True
+)
 
 
 # ──────────────────────────────────────────────
@@ -239,36 +107,90 @@ if os.path.exists("bg.jpg"):
 # ──────────────────────────────────────────────
 
 REQUIRED_COLUMNS = ['Image URL', 'Public ID', 'Category', 'Color', 'Season']
+# Tag columns hold a handful of repeated values, so keep them categorical
+CATEGORICAL_COLUMNS = ['Category', 'Color', 'Season']
 
-def save_metadata(image_url, public_id, category, color, season):
-    """Append one item to the metadata CSV."""
-    if os.path.exists(METADATA_FILE):
-        df = pd.read_csv(METADATA_FILE)
-        if not all(col in df.columns for col in REQUIRED_COLUMNS):
-            df = pd.DataFrame(columns=REQUIRED_COLUMNS)
-    else:
-        df = pd.DataFrame(columns=REQUIRED_COLUMNS)
 
-    new_entry = pd.DataFrame({
-        'Image URL': [image_url],
-        'Public ID': [public_id],
-        'Category': [category],
-        'Color': [color],
-        'Season': [season],
-    })
+def empty_metadata():
+    """Return an empty metadata DataFrame with the expected dtypes."""
+    return pd.DataFrame(columns=REQUIRED_COLUMNS).astype(
+        {col: 'category' for col in CATEGORICAL_COLUMNS}
+    )
+
 
-    df = pd.concat([df, new_entry], ignore_index=True)
-    df.to_csv(METADATA_FILE, index=False)
+def _metadata_header():
+    """Return (header, prefix) for appending rows to the metadata CSV.
+
+    header is the file's column order; prefix is a newline to write first
+    if the last row is unterminated.
+    """
+    if os.path.exists(METADATA_FILE) and os.path.getsize(METADATA_FILE) > 0:
+        with open(METADATA_FILE, 'rb') as f:
+            header = next(csv.reader([f.readline().decode('utf-8-sig')]), [])
+            f.seek(-1, os.SEEK_END)
+            ends_with_newline = f.read(1) == b'\n'
+        if all(col in header for col in REQUIRED_COLUMNS):
+            return header, '' if ends_with_newline else '\n'
+
+    # Missing, empty or unrecognised file: start over with just the header
+    with open(METADATA_FILE, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f, lineterminator='\n').writerow(REQUIRED_COLUMNS)
+    return REQUIRED_COLUMNS, ''
+
+
+def save_metadata_many(items):
+    """Append several items (dicts keyed by REQUIRED_COLUMNS) to the metadata CSV."""
+    if not items:
+        return
+    header, prefix = _metadata_header()
+    lines = StringIO()
+    lines.write(prefix)
+    # Follow the file's own column order; extra hand-added columns stay blank
+    csv.DictWriter(lines, fieldnames=header, restval='', lineterminator='\n').writerows(items)
+
+    # A single O_APPEND write keeps concurrent sessions from interleaving rows
+    fd = os.open(METADATA_FILE, os.O_APPEND | os.O_WRONLY | os.O_CREAT)
+    try:
+        os.write(fd, lines.getvalue().encode('utf-8'))
+    finally:
+        os.close(fd)
+    _read_metadata.clear()
+
+
+@st.cache_data(show_spinner=False)
+def _read_metadata(mtime):
+    """Parse the metadata CSV; cached per file modification time."""
+    # Read tags as strings and convert afterwards: the pyarrow engine rejects
+    # blank cells when asked for categoricals, and types an all-blank column
+    # as null, which can't become a categorical either
+    df = pd.read_csv(
+        METADATA_FILE,
+        engine='pyarrow',
+        dtype_backend='pyarrow',
+        dtype={col: 'string[pyarrow]' for col in ['Image URL'] + CATEGORICAL_COLUMNS},
+    )
+    if 'Image URL' in df.columns:
+        df = df.fillna({'Image URL': ''})
+    return df.astype({col: 'category' for col in CATEGORICAL_COLUMNS if col in df.columns})
 
 
 def load_metadata():
     """Load the metadata CSV into a DataFrame."""
     if os.path.exists(METADATA_FILE):
-        df = pd.read_csv(METADATA_FILE)
+        df = _read_metadata(os.path.getmtime(METADATA_FILE))
         if not all(col in df.columns for col in REQUIRED_COLUMNS):
-            df = pd.DataFrame(columns=REQUIRED_COLUMNS)
+            df = empty_metadata()
         return df
-    return pd.DataFrame(columns=REQUIRED_COLUMNS)
+    return empty_metadata()
+
+
+def thumbnail_url(image_url):
+    """Return a Cloudinary URL that delivers a resized version of image_url."""
+    if "/image/upload/" not in image_url:
+        return image_url
+    return image_url.replace(
+        "/image/upload/", f"/image/upload/{THUMBNAIL_TRANSFORMATION}/", 1
+    )
 
 
 def delete_item(index):
@@ -277,96 +199,208 @@ def delete_item(index):
     if not df.empty and index in df.index:
         public_id = df.at[index, 'Public ID']
         try:
-            cloudinary.uploader.destroy(public_id)
+            get_cloudinary_uploader().destroy(public_id)
         except Exception as e:
             st.warning(f"Could not delete from Cloudinary: {e}")
         df = df.drop(index).reset_index(drop=True)
         df.to_csv(METADATA_FILE, index=False)
+        _read_metadata.clear()
 
 
 # ──────────────────────────────────────────────
 # Upload helper
 # ──────────────────────────────────────────────
 
-def upload_to_cloudinary(file_bytes, filename):
-    """Upload an image to Cloudinary and return (url, public_id)."""
-    try:
-        result = cloudinary.uploader.upload(
-            file_bytes,
-            folder="wardrobe",
-            public_id=os.path.splitext(filename)[0],
-            overwrite=True,
-            resource_type="image",
-        )
-        return result['secure_url'], result['public_id']
-    except Exception as e:
-        st.error(f"Cloudinary upload failed: {e}")
-        return None, None
+def compress_image(uploaded_file):
+    """Downscale an uploaded image and re-encode it as JPEG bytes for upload."""
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(Image.open(uploaded_file))
+    image.thumbnail((UPLOAD_MAX_SIZE, UPLOAD_MAX_SIZE), Image.Resampling.LANCZOS)
+    if image.mode in ("RGBA", "LA", "P"):
+        # Flatten transparency onto white rather than JPEG's default black
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=UPLOAD_JPEG_QUALITY, optimize=True, progressive=True)
+    uploaded_file.seek(0)
+    return buffer.getvalue()
+
+
+def upload_to_cloudinary(uploader, file_bytes, filename):
+    """Upload an image with a configured Cloudinary uploader and return (url, public_id); raises on failure."""
+    result = uploader.upload(
+        file_bytes,
+        folder="wardrobe",
+        public_id=os.path.splitext(filename)[0],
+        overwrite=True,
+        resource_type="image",
+    )
+    return result['secure_url'], result['public_id']
+
+
+def upload_many_to_cloudinary(files):
+    """Upload several (file_bytes, filename) pairs concurrently.
+
+    Returns a list of (url, public_id) for the uploads that succeeded.
+    Errors are reported here, on the script thread, since worker threads
+    can't write to the page.
+    """
+    # Resolve the cached uploader here: st.cache_resource needs the script
+    # thread's context, so workers must not call it themselves
+    uploader = get_cloudinary_uploader()
+
+    def attempt(file):
+        try:
+            return upload_to_cloudinary(uploader, *file), None
+        except Exception as e:
+            return None, e
+
+    workers = max(1, min(MAX_PARALLEL_UPLOADS, len(files)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(attempt, files))
+
+    uploaded = []
+    for (_, filename), (result, error) in zip(files, results):
+        if error is not None:
+            st.error(f"Cloudinary upload failed for {filename}: {error}")
+        else:
+            uploaded.append(result)
+    return uploaded
 
 
 # ──────────────────────────────────────────────
 # AI outfit suggestions via OpenRouter
 # ──────────────────────────────────────────────
 
-def get_outfit_suggestions(user_prompt, df):
-    """Send wardrobe data + user prompt to OpenRouter and return parsed outfits."""
-    clothes_list = "\n".join(
-        f"{row['Image URL']},{row['Category']},{row['Color']},{row['Season']}"
-        for _, row in df.iterrows()
-    )
+def wardrobe_fingerprint(df):
+    """Hash the wardrobe contents so cached suggestions expire when it changes."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    return xxhash.xxh3_64(row_hashes.tobytes()).hexdigest()
 
-    system_message = (
-        "You are an AI fashion stylist. The user has a wardrobe of clothes. "
-        "Choose outfit sets based on their request. "
-        "Return ONLY a JSON array of arrays, where each inner array contains the Image URLs of one outfit. "
-        "Example: [[\"url1\", \"url2\"], [\"url3\", \"url4\"]]. "
-        "Do NOT include any other text, markdown, or explanation — just the raw JSON."
-    )
 
-    user_message = (
+OUTFIT_SYSTEM_MESSAGE = (
+    "You are an AI fashion stylist. The user has a wardrobe of clothes. "
+    "Choose outfit sets based on their request. "
+    "Return ONLY a JSON array of arrays, where each inner array contains the Image URLs of one outfit. "
+    "Example: [[\"url1\", \"url2\"], [\"url3\", \"url4\"]]. "
+    "Do NOT include any other text, markdown, or explanation — just the raw JSON."
+)
+
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=OUTFIT_CACHE_TTL)
+def build_wardrobe_prompt(fingerprint, _df):
+    """Format the wardrobe listing message; cached per wardrobe fingerprint."""
+    # One "url,category,color,season" line per item, built column-wise
+    clothes_list = "\n".join(
+        _df['Image URL'].astype(str)
+        .str.cat(_df[['Category', 'Color', 'Season']].astype(str), sep=',', na_rep='')
+        .tolist()
+    )
+    return (
         f"Here is my wardrobe:\n"
         f"Image URL, Category, Color, Season\n"
-        f"{clothes_list}\n\n"
-        f"Request: {user_prompt}"
+        f"{clothes_list}"
     )
 
-    try:
-        response = openrouter_client.chat.completions.create(
-            model=OPENROUTER_MODEL,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message},
-            ],
-            temperature=0.7,
-            max_tokens=4096,
-        )
 
-        raw = response.choices[0].message.content.strip()
+class OutfitParseError(ValueError):
+    """The model's reply could not be parsed as outfit JSON."""
+
+    def __init__(self, message, raw):
+        super().__init__(message)
+        self.raw = raw
+
+
+@st.cache_data(show_spinner=False, ttl=OUTFIT_CACHE_TTL, max_entries=OUTFIT_CACHE_MAX_ENTRIES)
+def fetch_outfit_suggestions(prompt_key, fingerprint, _user_prompt, _df):
+    """Ask OpenRouter for outfits; cached per normalised prompt and wardrobe fingerprint.
+
+    Raises on any failure, so only successful suggestions are cached.
+    """
+    # The system and wardrobe messages are identical across requests for
+    # the same closet, so providers with prompt caching can reuse that
+    # prefix; only the final request message varies.
+    response = get_openrouter_client().chat.completions.create(
+        model=OPENROUTER_MODEL,
+        messages=[
+            {"role": "system", "content": OUTFIT_SYSTEM_MESSAGE},
+            {"role": "user", "content": build_wardrobe_prompt(fingerprint, _df)},
+            {"role": "user", "content": f"Request: {_user_prompt}"},
+        ],
+        temperature=0.7,
+        max_tokens=min(OUTFIT_MAX_TOKENS, OUTFIT_BASE_TOKENS + OUTFIT_TOKENS_PER_ITEM * len(_df)),
+        stream=True,
+    )
 
-        # Handle markdown code blocks
-        if "```" in raw:
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-            raw = raw.strip()
+    # Stream the reply, showing progress as each outfit array closes,
+    # and stop reading once the outer [[...]] array is complete
+    progress = st.empty()
+    chunks = []
+    depth = outfits_seen = 0
+    complete = False
+    try:
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content or ""
+            chunks.append(piece)
+            for ch in piece:
+                if ch == "[":
+                    depth += 1
+                elif ch == "]":
+                    depth -= 1
+                    if depth == 1:
+                        # An inner outfit array just closed
+                        outfits_seen += 1
+                        progress.markdown(f"✨ Outfit {outfits_seen} suggested…")
+                    elif depth == 0 and outfits_seen:
+                        complete = True
+                        break
+            if complete:
+                break
+    finally:
+        response.close()
+        progress.empty()
+
+    raw = "".join(chunks).strip()
+
+    # Handle markdown code blocks
+    if "```" in raw:
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+        raw = raw.strip()
+
+    # Extract the outermost JSON array [[...]] even if there's extra text
+    match = OUTFIT_JSON_RE.search(raw)
+    if match:
+        raw = match.group(0)
 
-        # Extract the outermost JSON array [[...]] even if there's extra text
-        match = re.search(r'\[\s*\[.*?\]\s*\]', raw, re.DOTALL)
-        if match:
-            raw = match.group(0)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        raise OutfitParseError(str(e), raw) from e
 
-        outfits = json.loads(raw)
-        return outfits
 
-    except json.JSONDecodeError as e:
+def get_outfit_suggestions(user_prompt, df):
+    """Send wardrobe data + user prompt to OpenRouter and return parsed outfits."""
+    prompt_key = " ".join(user_prompt.lower().split())
+    try:
+        return fetch_outfit_suggestions(prompt_key, wardrobe_fingerprint(df), user_prompt, df)
+    except OutfitParseError as e:
         st.error(f"Error parsing AI response: {e}")
-        st.code(raw)
+        st.code(e.raw)
         return None
     except Exception as e:
         st.error(f"Error getting outfit suggestions: {e}")
         return None
 
-
 # ──────────────────────────────────────────────
 # UI
 # ──────────────────────────────────────────────
@@ -411,17 +445,23 @@ selected_option = option_menu(
 # ══════════════════════════════════════════════
 # YOUR CLOSET
 # ══════════════════════════════════════════════
-if selected_option == "Your Closet":
-    st.sidebar.markdown("### 🔍 Filter Items")
+@st.fragment
+def render_closet():
     df = load_metadata()
 
-    unique_colors = df['Color'].dropna().unique()
-    unique_categories = df['Category'].dropna().unique()
-    unique_seasons = df['Season'].dropna().unique()
+    # Tag columns are categorical, so their distinct values need no scan
+    unique_colors = df['Color'].cat.categories.to_numpy()
+    unique_categories = df['Category'].cat.categories.to_numpy()
+    unique_seasons = df['Season'].cat.categories.to_numpy()
 
-    selected_colors = st.sidebar.multiselect('🎨 Color:', unique_colors)
-    selected_categories = st.sidebar.multiselect('👕 Category:', unique_categories)
-    selected_seasons = st.sidebar.multiselect('🌤️ Season:', unique_seasons)
+    # Header
+    st.markdown('<div class="section-header">👗 Your Closet</div>', unsafe_allow_html=True)
+
+    # Filters live in the page body: fragments can't put widgets in the sidebar
+    col_color, col_category, col_season = st.columns(3)
+    selected_colors = col_color.multiselect('🎨 Color:', unique_colors)
+    selected_categories = col_category.multiselect('👕 Category:', unique_categories)
+    selected_seasons = col_season.multiselect('🌤️ Season:', unique_seasons)
 
     if selected_colors:
         df = df[df['Color'].isin(selected_colors)]
@@ -430,32 +470,37 @@ if selected_option == "Your Closet":
     if selected_seasons:
         df = df[df['Season'].isin(selected_seasons)]
 
-    # Header
-    st.markdown('<div class="section-header">👗 Your Closet</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="section-sub">{len(df)} item{"s" if len(df) != 1 else ""} in your wardrobe</div>', unsafe_allow_html=True)
 
     if not df.empty:
-        cols = st.columns(4, gap="medium")
-        for index, row in df.iterrows():
-            with cols[index % 4]:
-                # Card with image, badges, and small delete icon
-                st.markdown(f"""
-                <div class="closet-card">
-                    <img src="{row['Image URL']}" alt="{row['Category']}" />
-                    <div class="card-label">
-                        <span class="card-badge">{row['Category']}</span>
-                        <span class="card-badge">{row['Color']}</span>
-                        <span class="card-badge">{row['Season']}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                # Small delete icon button
-                with st.container():
-                    st.markdown('<div class="small-del">', unsafe_allow_html=True)
-                    if st.button('🗑️', key=f"delete_{index}", help="Delete this item"):
+        # All cards go out as one HTML grid rather than one element per item.
+        # Cards are numbered so each matches its delete button below.
+        cards = "".join(
+            f'<div class="closet-card">'
+            f'<span class="card-number">#{number}</span>'
+            f'<img src="{thumbnail_url(image_url)}" alt="{category}" loading="lazy" decoding="async" />'
+            f'<div class="card-label">'
+            f'<span class="card-badge">{category}</span>'
+            f'<span class="card-badge">{color}</span>'
+            f'<span class="card-badge">{season}</span>'
+            f'</div></div>'
+            for number, (image_url, category, color, season) in enumerate(df[
+                ['Image URL', 'Category', 'Color', 'Season']
+            ].itertuples(index=False, name=None), start=1)
+        )
+        st.markdown(f'<div class="closet-grid">{cards}</div>', unsafe_allow_html=True)
+
+        # Delete buttons for the visible items, grouped below the grid
+        with st.expander("🗑️ Remove items"):
+            cols = st.columns(4, gap="medium")
+            for pos, (index, public_id) in enumerate(df['Public ID'].items()):
+                name = str(public_id).rsplit('/', 1)[-1]
+                with cols[pos % 4]:
+                    if st.button(f'🗑️ #{pos + 1} {name}', key=f"delete_{index}",
+                                 help=f"Delete item #{pos + 1} ({public_id})",
+                                 use_container_width=True):
                         delete_item(index)
-                        st.rerun()
-                    st.markdown('</div>', unsafe_allow_html=True)
+                        st.rerun(scope="fragment")
     else:
         st.markdown("""
         <div class="empty-state">
@@ -469,20 +514,25 @@ if selected_option == "Your Closet":
 # ══════════════════════════════════════════════
 # ADD NEW ITEMS
 # ══════════════════════════════════════════════
-if selected_option == "Add New Items":
+@st.fragment
+def render_add_items():
+    from PIL import Image
+
     st.markdown('<div class="section-header">➕ Add New Items</div>', unsafe_allow_html=True)
-    st.markdown('<div class="section-sub">Upload a photo and tag it to grow your wardrobe</div>', unsafe_allow_html=True)
+    st.markdown('<div class="section-sub">Upload one or more photos and tag them to grow your wardrobe</div>', unsafe_allow_html=True)
 
     # Two-column layout: preview on left, form on right
     col_preview, col_form = st.columns([1, 1], gap="large")
 
     with col_preview:
         st.markdown('<div class="upload-section">', unsafe_allow_html=True)
-        uploaded_image = st.file_uploader("📸 Drop your image here", type=['png', 'jpg', 'jpeg'])
+        uploaded_images = st.file_uploader(
+            "📸 Drop your images here", type=['png', 'jpg', 'jpeg'], accept_multiple_files=True
+        )
 
-        if uploaded_image:
+        for uploaded_image in uploaded_images:
             preview_image = Image.open(uploaded_image)
-            st.image(preview_image, caption="Preview", use_column_width=True)
+            st.image(preview_image, caption=uploaded_image.name, use_column_width=True)
             uploaded_image.seek(0)
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -510,22 +560,38 @@ if selected_option == "Add New Items":
         st.markdown("---")
 
         if st.button('🚀 Upload to Wardrobe', use_container_width=True):
-            if uploaded_image:
-                with st.spinner("Uploading to Cloudinary..."):
-                    image_url, public_id = upload_to_cloudinary(
-                        uploaded_image.getvalue(), uploaded_image.name
-                    )
-                if image_url:
-                    save_metadata(image_url, public_id, category, color, season)
-                    st.markdown('<div class="success-toast">✅ Item added to your wardrobe!</div>', unsafe_allow_html=True)
-            else:
+            if not uploaded_images:
                 st.warning("Please upload an image first.")
+            elif not all(tag and tag.strip() for tag in (category, color, season)):
+                st.warning("Please fill in the category, color and season.")
+            elif len({os.path.splitext(f.name)[0] for f in uploaded_images}) < len(uploaded_images):
+                # Same-named files would overwrite each other's Cloudinary image
+                st.warning("Some selected files share a name; please rename or remove the duplicates.")
+            else:
+                with st.spinner("Uploading to Cloudinary..."):
+                    uploaded = upload_many_to_cloudinary([
+                        (compress_image(uploaded_image), uploaded_image.name)
+                        for uploaded_image in uploaded_images
+                    ])
+                save_metadata_many([
+                    {
+                        'Image URL': image_url,
+                        'Public ID': public_id,
+                        'Category': category,
+                        'Color': color,
+                        'Season': season,
+                    }
+                    for image_url, public_id in uploaded
+                ])
+                if uploaded:
+                    st.markdown(f'<div class="success-toast">✅ {len(uploaded)} item{"s" if len(uploaded) != 1 else ""} added to your wardrobe!</div>', unsafe_allow_html=True)
 
 
 # ══════════════════════════════════════════════
 # SUGGEST OUTFITS
 # ══════════════════════════════════════════════
-if selected_option == "Suggest Outfits":
+@st.fragment
+def render_suggest_outfits():
     st.markdown('<div class="section-header">✨ AI Outfit Stylist</div>', unsafe_allow_html=True)
     st.markdown('<div class="section-sub">Tell us the occasion and our AI will pick the perfect outfit from your closet</div>', unsafe_allow_html=True)
 
@@ -567,3 +633,16 @@ if selected_option == "Suggest Outfits":
                                 """, unsafe_allow_html=True)
         else:
             st.warning("Please enter a prompt to get outfit suggestions.")
+
+
+# ══════════════════════════════════════════════
+# Page dispatch
+# ══════════════════════════════════════════════
+# Each page is a fragment, so filter changes and button clicks rerun only
+# that page instead of the whole script (CSS, title and menu included).
+if selected_option == "Your Closet":
+    render_closet()
+elif selected_option == "Add New Items":
+    render_add_items()
+elif selected_option == "Suggest Outfits":
+    render_suggest_outfits()